@@ -0,0 +1,335 @@
+"""Núcleo do editor: codificação, leitura e gravação de live_streams.sii.
+
+Este módulo não depende de tkinter e pode ser usado em scripts e testes
+sem criar a interface gráfica.
+"""
+import os
+import re
+from contextlib import contextmanager
+
+# Cabeçalho usado quando um arquivo novo é gravado do zero
+DEFAULT_UNIT = "live_stream_def : _nameless.28a.c076.a0f0"
+
+_CONTENT_RE = re.compile(r'"(.*?)"')
+# Linha " stream_data[i]: "..."" (o conteúdo entre aspas é o registro da estação)
+_ENTRY_RE = re.compile(rb'^([ \t]*)stream_data\[(\d+)\][ \t]*:[^"\r\n]*"[^"\r\n]*"[^\r\n]*(\r?\n|$)', re.M)
+# Linha " stream_data: N" com a quantidade de estações
+_COUNT_RE = re.compile(rb'^[ \t]*stream_data[ \t]*:[ \t]*(\d+)', re.M)
+
+
+class FileChangedError(Exception):
+    """O arquivo foi alterado no disco (ex.: pelo jogo) depois de carregado"""
+
+
+@contextmanager
+def atomic_open(path, mode='wb', **kwargs):
+    """Grava num arquivo temporário e só substitui o destino depois do fsync.
+
+    Se o programa cair no meio da gravação, o arquivo original fica intacto.
+    """
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def file_stat(path):
+    """Tamanho e mtime do arquivo, usados para detectar alterações externas"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def decode_escaped_string(s):
+    # Texto ASCII sem escapes já está decodificado
+    if s.isascii() and '\\' not in s:
+        return s
+    try:
+        # Primeiro, interpreta as sequências de escape (como \xd0) como bytes
+        bytes_content = s.encode('latin1').decode('unicode-escape').encode('latin1')
+
+        # Agora decodifica os bytes resultantes como UTF-8
+        return bytes_content.decode('utf-8')
+    except Exception as e:
+        print(f"Erro ao decodificar '{s}': {e}")
+        return s
+
+
+def encode_to_escaped(s):
+    # ASCII imprimível sem barra invertida não precisa de escape
+    if s.isascii() and s.isprintable() and '\\' not in s:
+        return s
+    try:
+        # Converte para bytes UTF-8, depois cria sequência de escape
+        return s.encode('utf-8').decode('latin1').encode('unicode-escape').decode('ascii')
+    except Exception as e:
+        print(f"Erro ao codificar '{s}': {e}")
+        return s
+
+
+def parse_line(line):
+    """Converte uma linha stream_data[i] em estação (ou None se não for um registro)"""
+    match = _CONTENT_RE.search(line)
+    if not match:
+        return None
+
+    parts = match.group(1).split('|')
+    if len(parts) < 5:
+        return None
+
+    # Decodifica cada parte
+    decoded_parts = [decode_escaped_string(part) for part in parts]
+
+    return {
+        'url': decoded_parts[0],
+        'name': decoded_parts[1],
+        'genre': decoded_parts[2],
+        'country': decoded_parts[3],
+        'bitrate': decoded_parts[4],
+        'favorite': bool(int(decoded_parts[5])) if len(decoded_parts) > 5 else False
+    }
+
+
+def format_record(station):
+    """Codifica uma estação no formato url|nome|gênero|país|bitrate|favorita"""
+    url_encoded = encode_to_escaped(station['url'])
+    name_encoded = encode_to_escaped(station['name'])
+    genre_encoded = encode_to_escaped(station['genre'])
+    return f'{url_encoded}|{name_encoded}|{genre_encoded}|{station["country"]}|{station["bitrate"]}|{int(station["favorite"])}'
+
+
+def read_station_count(data):
+    """Retorna o valor de "stream_data: N" nos bytes informados (ou None)"""
+    match = _COUNT_RE.search(data)
+    return int(match.group(1)) if match else None
+
+
+def load_document(filename):
+    """Carrega o arquivo mantendo o documento original (para salvar só o que mudou)"""
+    return SiiDocument.load(filename)
+
+
+def load_file(filename):
+    """Retorna a lista de estações do arquivo"""
+    return load_document(filename).stations()
+
+
+def write_file(filename, stations):
+    """Grava um arquivo novo completo (usado quando não há documento original)"""
+    with atomic_open(filename, 'w', encoding='utf-8') as f:
+        # Escreve o cabeçalho SiiNunit
+        f.write("SiiNunit\n")
+        f.write("{\n")
+        f.write(f"{DEFAULT_UNIT} {{\n")
+        f.write(f" stream_data: {len(stations)}\n")
+
+        # Escreve cada estação
+        for i, station in enumerate(stations):
+            f.write(f' stream_data[{i}]: "{format_record(station)}"\n')
+
+        # Fecha a estrutura
+        f.write(" }\n")
+        f.write("}\n")
+
+
+class SiiDocument:
+    """Modelo sem perdas de um arquivo live_streams.sii.
+
+    Guarda os bytes originais e a posição (span) de cada stream_data[i].
+    Ao salvar, só os registros alterados, adicionados ou removidos são
+    recodificados e encaixados nos bytes originais; o resto do arquivo
+    (cabeçalho, nome da unidade, atributos desconhecidos) fica idêntico.
+    """
+
+    def __init__(self, data):
+        self.data = bytes(data)
+        self.path = None
+        self.stat = None
+        self.newline = b'\r\n' if b'\r\n' in self.data else b'\n'
+        self.count_span = None
+        self.records = []
+        self.dropped = []
+        self.scan()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            document = cls(f.read())
+            document.stat = (len(document.data), os.fstat(f.fileno()).st_mtime_ns)
+        document.path = path
+        return document
+
+    def reload(self):
+        """Relê o arquivo do disco, descartando os spans antigos"""
+        with open(self.path, 'rb') as f:
+            self.data = f.read()
+            self.stat = (len(self.data), os.fstat(f.fileno()).st_mtime_ns)
+        self.newline = b'\r\n' if b'\r\n' in self.data else b'\n'
+        self.scan()
+
+    def check_unchanged(self, path):
+        """Levanta FileChangedError se o arquivo no disco não é mais o que foi carregado"""
+        if path != self.path or not os.path.exists(path):
+            return
+        if file_stat(path) == self.stat:
+            return
+        # mtime mudou: só é alteração de verdade se o conteúdo for diferente
+        with open(path, 'rb') as f:
+            if f.read() != self.data:
+                raise FileChangedError(path)
+        self.stat = file_stat(path)
+
+    def scan(self):
+        """Localiza a contagem e os registros stream_data[i] nos bytes originais"""
+        count = _COUNT_RE.search(self.data)
+        self.count_span = count.span(1) if count else None
+
+        self.records = []
+        self.dropped = []
+        for match in _ENTRY_RE.finditer(self.data):
+            station = parse_line(match.group(0).decode('utf-8'))
+            if station is None:
+                # Registros ilegíveis não viram estações e são descartados ao salvar
+                self.dropped.append(match.span())
+                continue
+            self.records.append({
+                'start': match.start(),
+                'end': match.end(),
+                'index': int(match.group(2)),
+                'indent': match.group(1),
+                'station': station
+            })
+
+    def stations(self):
+        """Retorna cópias das estações na ordem do arquivo"""
+        return [dict(record['station']) for record in self.records]
+
+    def format_line(self, index, station, indent):
+        content = format_record(station).encode('utf-8')
+        return indent + b'stream_data[%d]: "' % index + content + b'"' + self.newline
+
+    def diff(self, stations):
+        """Calcula os patches (início, fim, bytes novos, registros novos) para chegar em `stations`"""
+        patches = []
+        indent = self.records[0]['indent'] if self.records else b' '
+
+        if self.count_span and len(stations) != int(self.data[self.count_span[0]:self.count_span[1]]):
+            start, end = self.count_span
+            patches.append((start, end, str(len(stations)).encode('ascii'), []))
+
+        for start, end in self.dropped:
+            patches.append((start, end, b'', []))
+
+        # Registros na mesma posição e com o mesmo conteúdo mantêm os bytes originais
+        for i, record in enumerate(self.records[:len(stations)]):
+            station = stations[i]
+            if record['index'] == i and record['station'] == station:
+                continue
+            line = self.format_line(i, station, record['indent'])
+            patches.append((record['start'], record['end'], line, [(0, len(line), i, record['indent'], station)]))
+
+        for record in self.records[len(stations):]:
+            patches.append((record['start'], record['end'], b'', []))
+
+        if len(stations) > len(self.records):
+            position = self.insert_position()
+            chunk = b''
+            if position > 0 and self.data[position - 1:position] != b'\n':
+                chunk = self.newline
+            produced = []
+            for i in range(len(self.records), len(stations)):
+                line = self.format_line(i, stations[i], indent)
+                produced.append((len(chunk), len(line), i, indent, stations[i]))
+                chunk += line
+            patches.append((position, position, chunk, produced))
+
+        patches.sort(key=lambda patch: (patch[0], patch[1]))
+        return patches
+
+    def insert_position(self):
+        """Posição onde novos registros são inseridos (após o último existente)"""
+        ends = [record['end'] for record in self.records] + [end for _, end in self.dropped]
+        if ends:
+            return max(ends)
+        if self.count_span:
+            newline = self.data.find(b'\n', self.count_span[1])
+            return len(self.data) if newline == -1 else newline + 1
+        raise ValueError("stream_data não encontrado no arquivo")
+
+    def apply(self, patches):
+        """Aplica os patches aos bytes e atualiza os spans dos registros"""
+        pieces = []
+        records = []
+        cursor = 0
+        delta = 0
+        replaced = {(start, end) for start, end, _, _ in patches if start != end}
+        kept = iter(sorted(
+            (r for r in self.records if (r['start'], r['end']) not in replaced),
+            key=lambda r: r['start']
+        ))
+        pending = next(kept, None)
+
+        for start, end, new, produced in patches:
+            # Registros intactos antes deste patch só são deslocados
+            while pending is not None and pending['start'] < start:
+                records.append(dict(pending, start=pending['start'] + delta, end=pending['end'] + delta))
+                pending = next(kept, None)
+            pieces.append(self.data[cursor:start])
+            for offset, length, index, indent, station in produced:
+                records.append({
+                    'start': start + delta + offset,
+                    'end': start + delta + offset + length,
+                    'index': index,
+                    'indent': indent,
+                    'station': dict(station)
+                })
+            pieces.append(new)
+            delta += len(new) - (end - start)
+            cursor = end
+
+        while pending is not None:
+            records.append(dict(pending, start=pending['start'] + delta, end=pending['end'] + delta))
+            pending = next(kept, None)
+        pieces.append(self.data[cursor:])
+
+        if self.count_span:
+            start, end = self.count_span
+            shift = sum(len(new) - (e - s) for s, e, new, _ in patches if e <= start and (s, e) != (start, end))
+            count_patch = [new for s, e, new, _ in patches if (s, e) == (start, end)]
+            length = len(count_patch[0]) if count_patch else end - start
+            self.count_span = (start + shift, start + shift + length)
+
+        self.data = b''.join(pieces)
+        self.records = sorted(records, key=lambda r: r['start'])
+        self.dropped = []
+
+    def save(self, path, stations):
+        """Grava `stations` recodificando só os registros alterados.
+
+        O arquivo é gravado por inteiro num temporário e substituído
+        atomicamente; se ele foi alterado no disco desde o carregamento,
+        levanta FileChangedError sem gravar nada.
+        """
+        self.check_unchanged(path)
+        patches = self.diff(stations)
+        data = self.data
+
+        self.apply(patches)
+        try:
+            with atomic_open(path) as f:
+                f.write(self.data)
+        except BaseException:
+            # Falhou ao gravar: o documento volta a refletir o arquivo no disco
+            self.data = data
+            self.scan()
+            raise
+
+        self.path = path
+        self.stat = file_stat(path)
+        return len(patches)
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+from core import read_station_count
+
+TARGET_NAME = 'live_streams.sii'
+
+# Pastas dos jogos dentro de "Documentos" -> nome curto exibido
+GAME_FOLDERS = {
+    'Euro Truck Simulator 2': 'ETS2',
+    'American Truck Simulator': 'ATS',
+}
+PROFILE_FOLDERS = {'profiles', 'steam_profiles'}
+
+# Pastas que nunca contêm o live_streams.sii e podem ser grandes
+PRUNED_DIRS = {
+    'backup', 'cache', 'crash', 'mod', 'music', 'save', 'screenshot',
+    'shader_cache', 'steam_cache', 'video', 'videos', 'mtlib',
+}
+MAX_DEPTH = 4
+HEADER_SIZE = 64 * 1024
+
+
+def default_roots():
+    """Retorna as pastas dos jogos que existem nos locais padrão"""
+    home = Path.home()
+    documents = [
+        home / 'Documents',
+        home / 'OneDrive' / 'Documents',
+        home / 'Documentos',
+        home / '.local' / 'share',
+    ]
+    return [str(base / game) for base in documents for game in GAME_FOLDERS if (base / game).is_dir()]
+
+
+def profile_name(folder):
+    """Os perfis são pastas com o nome em hexadecimal; decodifica quando possível"""
+    try:
+        return bytes.fromhex(folder).decode('utf-8')
+    except ValueError:
+        return folder
+
+
+def describe(path):
+    """Identifica jogo e perfil a partir do caminho do arquivo"""
+    parts = Path(path).parts
+    game = next((GAME_FOLDERS[part] for part in reversed(parts) if part in GAME_FOLDERS), '')
+    profile = ''
+    if len(parts) >= 3 and parts[-3] in PROFILE_FOLDERS:
+        profile = profile_name(parts[-2])
+    return game, profile
+
+
+def read_header(path):
+    """Lê só o início do arquivo para obter a quantidade de estações"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    game, profile = describe(path)
+    return {
+        'path': path,
+        'game': game,
+        'profile': profile,
+        'count': read_station_count(header),
+        'modified': os.stat(path).st_mtime
+    }
+
+
+class StationFileFinder:
+    """Procura arquivos live_streams.sii em paralelo nas pastas configuradas.
+
+    Cada pasta é listada com os.scandir por um pool de threads. A listagem
+    fica em cache junto com o mtime da pasta; numa nova busca, pastas cujo
+    mtime não mudou não são listadas de novo.
+    """
+
+    def __init__(self, roots, cache_path=None, max_workers=8, max_depth=MAX_DEPTH):
+        self.roots = list(roots)
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.load_cache()
+
+    def load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar cache de busca: {e}")
+            self.cache = {}
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f)
+        except Exception as e:
+            print(f"Erro ao salvar cache de busca: {e}")
+
+    def scan_dir(self, path):
+        """Lista uma pasta: retorna (arquivos encontrados, subpastas a visitar)"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], []
+
+        with self.lock:
+            cached = self.cache.get(path)
+        if cached and cached['mtime'] == mtime:
+            return cached['files'], cached['dirs']
+
+        files, dirs = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in PRUNED_DIRS:
+                                dirs.append(entry.path)
+                        elif entry.name.lower() == TARGET_NAME:
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            return [], []
+
+        with self.lock:
+            self.cache[path] = {'mtime': mtime, 'files': files, 'dirs': dirs}
+        return files, dirs
+
+    def find(self):
+        """Retorna os caminhos de todos os live_streams.sii abaixo das raízes"""
+        found = []
+        visited = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {}
+            for root in self.roots:
+                if os.path.isdir(root):
+                    pending[pool.submit(self.scan_dir, root)] = (root, 0)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, depth = pending.pop(future)
+                    visited.add(path)
+                    files, dirs = future.result()
+                    found.extend(files)
+                    if depth < self.max_depth:
+                        for folder in dirs:
+                            pending[pool.submit(self.scan_dir, folder)] = (folder, depth + 1)
+
+        # Pastas que não existem mais saem do cache
+        self.cache = {path: entry for path, entry in self.cache.items() if path in visited}
+        self.save_cache()
+        return sorted(found)
+
+    def discover(self):
+        """Procura os arquivos e lê o cabeçalho de cada um"""
+        paths = self.find()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self.safe_header, paths))
+        return [result for result in results if result is not None]
+
+    def safe_header(self, path):
+        try:
+            return read_header(path)
+        except OSError as e:
+            print(f"Erro ao ler {path}: {e}")
+            return None
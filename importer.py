@@ -0,0 +1,191 @@
+import csv
+import json
+import os
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+from validation import fix_value
+
+CHUNK_SIZE = 64 * 1024
+# Um registro JSON maior que isso indica arquivo corrompido (evita ler tudo na memória)
+MAX_RECORD_SIZE = 4 * 1024 * 1024
+MAX_TAGS = 3
+DEFAULT_BITRATE = '128'
+
+# Nomes de campo aceitos nos dumps (o primeiro preenchido vence)
+FIELD_ALIASES = {
+    'url': ('url_resolved', 'url', 'stream_url', 'stream'),
+    'name': ('name', 'title'),
+    'tags': ('tags', 'genre', 'genres'),
+    'country': ('countrycode', 'country_code', 'iso_3166_1', 'country'),
+    'bitrate': ('bitrate',),
+    'codec': ('codec',),
+}
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def iter_json_records(stream, chunk_size=CHUNK_SIZE):
+    """Lê objetos de um array JSON (ou JSON Lines) em blocos, um registro por vez"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    while True:
+        # Pula separadores entre registros: espaços, vírgulas e os colchetes do array
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,[]':
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                return
+            chunk = stream.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            # Registro incompleto: lê mais um bloco e tenta de novo
+            if eof or len(buffer) - pos > MAX_RECORD_SIZE:
+                raise
+            chunk = stream.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+
+        pos = end
+        if isinstance(record, dict):
+            yield record
+
+
+def iter_records(path, chunk_size=CHUNK_SIZE):
+    """Itera os registros de um dump JSON/JSON Lines/CSV sem carregá-lo inteiro"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in ('.json', '.jsonl', '.ndjson', '.csv'):
+            # Extensão desconhecida: decide pelo primeiro caractere
+            first = f.read(1024).lstrip()[:1]
+            f.seek(0)
+            extension = '.json' if first in ('[', '{') else '.csv'
+
+        if extension == '.csv':
+            yield from csv.DictReader(f)
+        else:
+            yield from iter_json_records(f, chunk_size)
+
+
+def pick(record, field):
+    for key in FIELD_ALIASES[field]:
+        value = record.get(key)
+        if value not in (None, ''):
+            return value
+    return ''
+
+
+def split_tags(value):
+    if isinstance(value, list):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    return [tag.strip() for tag in str(value).split(',') if tag.strip()]
+
+
+def parse_bitrate(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def normalize_url(url):
+    """Normaliza a URL para detectar estações duplicadas"""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip().lower()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path.rstrip('/'), parts.query, ''))
+
+
+def to_station(record):
+    """Converte um registro do dump para o formato url|nome|gênero|país|bitrate|favorita"""
+    bitrate = parse_bitrate(pick(record, 'bitrate'))
+    return {
+        'url': fix_value('url', str(pick(record, 'url'))),
+        'name': fix_value('name', str(pick(record, 'name'))),
+        'genre': fix_value('genre', ', '.join(split_tags(pick(record, 'tags'))[:MAX_TAGS])),
+        'country': fix_value('country', str(pick(record, 'country'))),
+        'bitrate': str(bitrate) if bitrate > 0 else DEFAULT_BITRATE,
+        'favorite': False
+    }
+
+
+class ImportStats:
+    def __init__(self):
+        self.records = 0
+        self.imported = 0
+        self.filtered = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        """Registros lidos por segundo"""
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class StationImporter:
+    """Importa estações de dumps de diretórios de rádio, filtrando e removendo duplicadas"""
+
+    def __init__(self, countries=None, tags=None, min_bitrate=None, max_bitrate=None, codecs=None):
+        self.countries = {c.strip().upper() for c in countries or () if c.strip()}
+        self.tags = {t.strip().lower() for t in tags or () if t.strip()}
+        self.codecs = {c.strip().upper() for c in codecs or () if c.strip()}
+        self.min_bitrate = min_bitrate
+        self.max_bitrate = max_bitrate
+        self.stats = ImportStats()
+
+    def matches(self, record):
+        if self.countries and str(pick(record, 'country')).strip().upper() not in self.countries:
+            return False
+        if self.codecs and str(pick(record, 'codec')).strip().upper() not in self.codecs:
+            return False
+        if self.tags and not self.tags & {tag.lower() for tag in split_tags(pick(record, 'tags'))}:
+            return False
+        bitrate = parse_bitrate(pick(record, 'bitrate'))
+        if self.min_bitrate is not None and bitrate < self.min_bitrate:
+            return False
+        if self.max_bitrate is not None and bitrate > self.max_bitrate:
+            return False
+        return True
+
+    def run(self, path, existing=()):
+        """Gera as estações novas do dump, na ordem em que aparecem"""
+        self.stats = ImportStats()
+        seen = {normalize_url(station['url']) for station in existing}
+        started = time.perf_counter()
+
+        try:
+            for record in iter_records(path):
+                self.stats.records += 1
+                if not self.matches(record):
+                    self.stats.filtered += 1
+                    continue
+
+                station = to_station(record)
+                if not station['url'] or not station['name']:
+                    self.stats.invalid += 1
+                    continue
+
+                key = normalize_url(station['url'])
+                if key in seen:
+                    self.stats.duplicates += 1
+                    continue
+                seen.add(key)
+
+                self.stats.imported += 1
+                yield station
+        finally:
+            self.stats.elapsed = time.perf_counter() - started
@@ -0,0 +1,143 @@
+import json
+import os
+import time
+import zlib
+
+JOURNAL_SUFFIX = '.journal'
+STALE_SUFFIX = '.stale'
+
+
+def journal_path(path):
+    """Retorna o caminho do diário ao lado do arquivo aberto"""
+    return path + JOURNAL_SUFFIX
+
+
+def fingerprint(data):
+    """Identifica o conteúdo do arquivo base (tamanho + CRC32)"""
+    return f"{len(data)}:{zlib.crc32(data):08x}"
+
+
+def apply_operation(stations, operation):
+    """Aplica uma operação do diário sobre a lista de estações"""
+    kind = operation['op']
+    if kind == 'add':
+        stations.append(dict(operation['station']))
+    elif kind == 'edit':
+        stations[operation['index']] = dict(operation['station'])
+    elif kind == 'remove':
+        del stations[operation['index']]
+    elif kind == 'bulk':
+        # Aplica numa cópia: um lote com erro não deixa a lista pela metade
+        updated = list(stations)
+        for sub_operation in operation['ops']:
+            apply_operation(updated, sub_operation)
+        stations[:] = updated
+    else:
+        raise ValueError(f"Operação desconhecida no diário: {kind}")
+
+
+class EditJournal:
+    """Diário de edições (somente acréscimo) gravado ao lado do arquivo aberto.
+
+    A primeira linha identifica o arquivo base; cada linha seguinte é uma
+    operação em JSON. As gravações são enviadas ao sistema a cada operação,
+    mas o fsync é feito em lotes (a cada `sync_every` operações ou
+    `sync_interval` segundos).
+    """
+
+    def __init__(self, path, base, sync_every=20, sync_interval=2.0):
+        self.path = path
+        self.base = base
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.file = None
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def read(self):
+        """Retorna (base registrada no cabeçalho, operações) do diário existente"""
+        if not os.path.exists(self.path):
+            return None, []
+
+        header = None
+        operations = []
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                # Linha incompleta ou corrompida: o app caiu durante a escrita
+                if not raw.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    break
+                if header is None:
+                    header = entry
+                    continue
+                operations.append(entry)
+        return (header or {}).get('base'), operations
+
+    def pending(self):
+        """Operações pendentes, se o diário pertence ao arquivo base atual"""
+        base, operations = self.read()
+        return operations if base == self.base else []
+
+    def stale(self):
+        """Operações de um diário escrito para outra versão do arquivo base"""
+        base, operations = self.read()
+        return operations if base is not None and base != self.base else []
+
+    def set_aside(self):
+        """Move o diário atual para <diário>.stale (sem apagar edições) e retorna o novo caminho"""
+        stale_path = self.path + STALE_SUFFIX
+        if os.path.exists(stale_path):
+            stale_path = f"{self.path}.{time.strftime('%Y%m%d_%H%M%S')}{STALE_SUFFIX}"
+        os.replace(self.path, stale_path)
+        return stale_path
+
+    def open(self, operations=()):
+        """Recria o diário com o cabeçalho e as operações mantidas e passa a acrescentar"""
+        self.close()
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self.encode({'base': self.base}))
+            for operation in operations:
+                f.write(self.encode(operation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        self.file = open(self.path, 'ab')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def encode(self, entry):
+        return (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def append(self, operation):
+        if self.file is None:
+            return
+        self.file.write(self.encode(operation))
+        self.file.flush()
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        if self.file is not None and self.unsynced:
+            os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def compact(self, base):
+        """Descarta as operações já salvas no arquivo base (chamado após salvar)"""
+        self.base = base
+        self.open()
+
+    def close(self):
+        if self.file is not None:
+            try:
+                self.sync()
+            finally:
+                # Mesmo se o fsync falhar, o arquivo não fica aberto
+                self.file.close()
+                self.file = None
@@ -1,6 +1,5 @@
 import json
 import os
-import re
 import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -8,6 +7,23 @@ from tkinter import Menu
 from pathlib import Path
 from datetime import datetime
 
+import core
+from discovery import StationFileFinder, default_roots
+from importer import StationImporter
+from journal import EditJournal, apply_operation, fingerprint, journal_path
+from validation import StationValidator, fix_station
+
+# Mensagens padrão dos problemas de validação (quando o idioma não as define)
+ISSUE_MESSAGES = {
+    'forbidden_char': 'contains | or " (corrupts the record on save)',
+    'control_char': 'contains a tab, line break or other control character',
+    'whitespace': 'leading/trailing spaces',
+    'empty': 'empty value',
+    'url_invalid': 'invalid URL',
+    'country_invalid': 'invalid country code',
+    'bitrate_invalid': 'bitrate must be a number',
+}
+
 class RadioStationEditor:
 
     def __init__(self, root):
@@ -28,14 +44,21 @@ class RadioStationEditor:
         self.root.title(self.config['app_title'])
         self.stations = []
         self.current_file = ""
+        self.document = None
+        self.journal = None
+        self.journal_sync_job = None
+        self.finder = None
         self.sort_column = None
         self.sort_direction = False
+        self.validator = StationValidator()
+        self.issue_rows = []
         
         # Configurar a interface
         self.verify_structure()
         self.create_widgets()
         self.create_menu()
         self.load_language_config(self.current_language)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def get_language_path(self, lang_code):
         """Retorna o caminho completo para o arquivo de idioma"""
@@ -157,6 +180,14 @@ class RadioStationEditor:
             )
 
         menubar.add_cascade(label=self.config['buttons']['language'], menu=language_menu)
+        menubar.add_command(
+            label=self.config['buttons'].get('discover', '🔎 Find files'),
+            command=self.discover_files
+        )
+        menubar.add_command(
+            label=self.config['buttons'].get('import', '📥 Import'),
+            command=self.import_stations
+        )
         self.root.config(menu=menubar)
 
     def reload_ui(self):
@@ -171,6 +202,11 @@ class RadioStationEditor:
         for col, text_key in zip(self.tree['columns'], ['favorite', 'name', 'genre', 'country', 'bitrate']):
             self.tree.heading(col, text=self.config['columns'][text_key])
         
+        # Atualiza painel de validação
+        self.issues_label.config(text=self.config['messages'].get('issues_title', 'Problems'))
+        self.fix_all_button.config(text=self.config['messages'].get('fix_all_btn', 'Auto-fix all'))
+        self.refresh_issues_panel()
+
         # Atualiza menu
         self.create_menu()
 
@@ -267,6 +303,27 @@ class RadioStationEditor:
         
         main_frame.grid_rowconfigure(0, weight=1)
         main_frame.grid_columnconfigure(0, weight=1)
+
+        # Estações com problemas ficam destacadas
+        self.tree.tag_configure('invalid', background='#ffe0e0')
+
+        # Painel lateral com os problemas de validação
+        issues_frame = tk.Frame(main_frame)
+        issues_frame.grid(row=0, column=2, rowspan=2, sticky="ns", padx=(5, 0))
+
+        self.issues_label = tk.Label(issues_frame, text=self.config['messages'].get('issues_title', 'Problems'))
+        self.issues_label.pack(anchor=tk.W)
+
+        self.issues_list = tk.Listbox(issues_frame, width=40)
+        self.issues_list.pack(expand=True, fill=tk.Y)
+        self.issues_list.bind('<<ListboxSelect>>', lambda e: self.jump_to_issue())
+
+        self.fix_all_button = tk.Button(
+            issues_frame,
+            text=self.config['messages'].get('fix_all_btn', 'Auto-fix all'),
+            command=self.fix_all_issues
+        )
+        self.fix_all_button.pack(fill=tk.X, pady=(5, 0))
         
         # Eventos
         self.tree.bind('<Double-1>', lambda e: self.edit_selected_station())
@@ -302,8 +359,8 @@ class RadioStationEditor:
                 header_text = header_text.split(' ↓')[0].split(' ↑')[0]
             self.tree.heading(col, text=header_text)
         
-    def open_file(self):
-        file_path = filedialog.askopenfilename(filetypes=[("SII files", "*.sii"), ("All files", "*.*")])
+    def open_file(self, file_path=None):
+        file_path = file_path or filedialog.askopenfilename(filetypes=[("SII files", "*.sii"), ("All files", "*.*")])
         if file_path:
             # Criar backup antes de abrir
             try:
@@ -330,8 +387,238 @@ class RadioStationEditor:
 
             self.current_file = file_path
             self.stations = self.load_file(file_path)
+            try:
+                self.open_journal(file_path)
+            except OSError as e:
+                # Pasta somente leitura, disco cheio...: o arquivo abre mesmo sem diário
+                self.disable_journal(e)
+            self.validator.validate_all(self.stations)
             self.update_treeview()
 
+    def discover_files(self):
+        """Procura os live_streams.sii dos perfis dos jogos e mostra um seletor"""
+        messages = self.config['messages']
+        if self.finder is None:
+            self.finder = StationFileFinder(default_roots(), str(self.base_dir / "discovery_cache.json"))
+        found = self.finder.discover()
+
+        if not found:
+            messagebox.showinfo(
+                messages.get('discover_title', 'Radio files'),
+                messages.get('discover_none', 'No live_streams.sii file was found.')
+            )
+            return
+
+        picker = tk.Toplevel(self.root)
+        picker.title(messages.get('discover_title', 'Radio files'))
+
+        columns = ('Game', 'Profile', 'Stations', 'Modified', 'Path')
+        tree = ttk.Treeview(picker, columns=columns, show='headings', height=min(len(found), 15))
+        headings = [
+            messages.get('game_label', 'Game'),
+            messages.get('profile_label', 'Profile'),
+            messages.get('stations_label', 'Stations'),
+            messages.get('modified_label', 'Modified'),
+            messages.get('path_label', 'Path')
+        ]
+        for col, text in zip(columns, headings):
+            tree.heading(col, text=text)
+        tree.column('Game', width=60, anchor=tk.CENTER)
+        tree.column('Profile', width=150, anchor=tk.W)
+        tree.column('Stations', width=80, anchor=tk.CENTER)
+        tree.column('Modified', width=130, anchor=tk.CENTER)
+        tree.column('Path', width=400, anchor=tk.W)
+
+        for i, info in enumerate(found):
+            tree.insert('', 'end', iid=str(i), values=(
+                info['game'],
+                info['profile'] or '-',
+                info['count'] if info['count'] is not None else '?',
+                datetime.fromtimestamp(info['modified']).strftime("%Y-%m-%d %H:%M"),
+                info['path']
+            ))
+        tree.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+
+        def open_selected():
+            selected = tree.selection()
+            if not selected:
+                return
+            picker.destroy()
+            self.open_file(found[int(selected[0])]['path'])
+
+        tree.bind('<Double-1>', lambda e: open_selected())
+        tk.Button(picker, text=self.config['buttons']['open'], command=open_selected).pack(pady=5)
+
+    def import_stations(self):
+        """Importa estações de um dump (JSON/CSV) de diretório de rádios"""
+        file_path = filedialog.askopenfilename(filetypes=[
+            ("JSON/CSV", "*.json *.jsonl *.ndjson *.csv"),
+            ("All files", "*.*")
+        ])
+        if not file_path:
+            return
+
+        messages = self.config['messages']
+        dialog = tk.Toplevel(self.root)
+        dialog.title(messages.get('import_title', 'Import stations'))
+
+        # Filtros opcionais (listas separadas por vírgula)
+        fields = [
+            ('countries', messages.get('import_countries_label', 'Countries (e.g. BR, PT):')),
+            ('tags', messages.get('import_tags_label', 'Tags (e.g. rock, jazz):')),
+            ('min_bitrate', messages.get('import_min_bitrate_label', 'Minimum bitrate:')),
+            ('codecs', messages.get('import_codecs_label', 'Codecs (e.g. MP3, AAC):'))
+        ]
+        entries = {}
+        for row, (key, label) in enumerate(fields):
+            tk.Label(dialog, text=label).grid(row=row, column=0, sticky=tk.E, padx=5, pady=5)
+            entries[key] = tk.Entry(dialog, width=30)
+            entries[key].grid(row=row, column=1, padx=5, pady=5)
+
+        def run_import():
+            min_bitrate = entries['min_bitrate'].get().strip()
+            importer = StationImporter(
+                countries=entries['countries'].get().split(','),
+                tags=entries['tags'].get().split(','),
+                min_bitrate=int(min_bitrate) if min_bitrate.isdigit() else None,
+                codecs=entries['codecs'].get().split(',')
+            )
+            dialog.destroy()
+            self.import_from_file(file_path, importer)
+
+        tk.Button(dialog, text=messages.get('import_btn', 'Import'), command=run_import).grid(
+            row=len(fields), column=1, sticky=tk.E, padx=5, pady=5
+        )
+
+    def import_from_file(self, file_path, importer):
+        """Executa a importação e adiciona as estações novas ao final da lista"""
+        messages = self.config['messages']
+        try:
+            new_stations = list(importer.run(file_path, self.stations))
+        except Exception as e:
+            messagebox.showerror(
+                messages.get('error_title', 'Error'),
+                messages.get('import_error', 'Error importing file: {error}').format(error=str(e))
+            )
+            return
+
+        if new_stations:
+            first = len(self.stations)
+            self.stations.extend(new_stations)
+            self.record_edit({'op': 'bulk', 'ops': [{'op': 'add', 'station': s} for s in new_stations]})
+            self.validator.revalidate(self.stations, range(first, len(self.stations)))
+            self.update_treeview()
+
+        stats = importer.stats
+        messagebox.showinfo(
+            messages.get('success_title', 'Success'),
+            messages.get(
+                'import_result',
+                'Imported {imported} of {records} records ({rate:.0f} records/s).\n{duplicates} duplicate(s) skipped.'
+            ).format(imported=stats.imported, records=stats.records, duplicates=stats.duplicates, rate=stats.rate)
+        )
+
+    def open_journal(self, file_path):
+        """Abre o diário de edições do arquivo e recupera edições não salvas"""
+        if self.journal is not None:
+            self.journal.close()
+
+        self.journal = EditJournal(journal_path(file_path), fingerprint(self.document.data))
+        pending = self.journal.pending()
+        recovered = []
+        question = self.config['messages'].get(
+            'recover_confirm',
+            'Found {count} unsaved edit(s) from a previous session.\nRecover them?'
+        )
+        stale_path = ''
+
+        if not pending:
+            pending = self.journal.stale()
+            if pending:
+                # O arquivo mudou desde que o diário foi escrito (ex.: o jogo o regravou):
+                # o diário é guardado à parte em vez de ser apagado
+                stale_path = self.journal.set_aside()
+                question = self.config['messages'].get(
+                    'recover_stale_confirm',
+                    'Found {count} unsaved edit(s) made on a different version of this file.\n'
+                    'They were kept in:\n{path}\n\nReplay them on the current file anyway?'
+                )
+
+        if pending and messagebox.askyesno(
+            self.config['messages'].get('recover_title', 'Recover edits'),
+            question.format(count=len(pending), path=stale_path)
+        ):
+            for operation in pending:
+                try:
+                    apply_operation(self.stations, operation)
+                except (IndexError, KeyError, TypeError, ValueError) as e:
+                    print(f"Erro ao recuperar edição {operation}: {e}")
+                    # As edições não aplicadas continuam guardadas à parte
+                    if not stale_path:
+                        stale_path = self.journal.set_aside()
+                    messagebox.showwarning(
+                        self.config['messages'].get('warning_title', 'Warning'),
+                        self.config['messages'].get(
+                            'recover_partial',
+                            'Only {recovered} of {count} unsaved edit(s) could be recovered.\n'
+                            'The complete journal was kept in:\n{path}'
+                        ).format(recovered=len(recovered), count=len(pending), path=stale_path)
+                    )
+                    break
+                recovered.append(operation)
+
+        # Reescreve o diário só com o que foi recuperado (descarta linha incompleta, se houver)
+        self.journal.open(recovered)
+
+    def disable_journal(self, error):
+        """Desliga o diário após uma falha de escrita e avisa o usuário"""
+        if self.journal is not None:
+            try:
+                self.journal.close()
+            except OSError:
+                pass
+        self.journal = None
+        messagebox.showwarning(
+            self.config['messages'].get('warning_title', 'Warning'),
+            self.config['messages'].get(
+                'journal_warning',
+                'Could not write the edit journal:\n{error}\n\nUnsaved edits will not be recovered after a crash.'
+            ).format(error=str(error))
+        )
+
+    def record_edit(self, operation):
+        """Registra uma edição no diário antes de qualquer salvamento"""
+        if self.journal is not None:
+            try:
+                self.journal.append(operation)
+            except OSError as e:
+                # Um diário com uma edição faltando não pode mais ser reaplicado
+                self.disable_journal(e)
+                return
+            # Garante o fsync dentro do intervalo mesmo que não venham novas edições
+            if self.journal.unsynced and self.journal_sync_job is None:
+                self.journal_sync_job = self.root.after(
+                    int(self.journal.sync_interval * 1000), self.sync_journal
+                )
+
+    def sync_journal(self):
+        self.journal_sync_job = None
+        if self.journal is not None:
+            try:
+                self.journal.sync()
+            except OSError as e:
+                self.disable_journal(e)
+
+    def on_close(self):
+        try:
+            if self.journal is not None:
+                self.journal.close()
+        except OSError as e:
+            self.disable_journal(e)
+        finally:
+            # A janela sempre fecha, mesmo se o diário não puder ser gravado
+            self.root.destroy()
+
     def save_file(self):
         if not self.current_file:
             messagebox.showerror(
@@ -349,27 +636,41 @@ class RadioStationEditor:
         
         if not self.current_file.lower().endswith('.sii'):
             self.current_file += '.sii'
+
+        if not self.fix_corrupting_stations():
+            return
         
         try:
-            with open(self.current_file, 'w', encoding='utf-8') as f:
-                # Escreve o cabeçalho SiiNunit
-                f.write("SiiNunit\n")
-                f.write("{\n")
-                f.write("live_stream_def : _nameless.28a.c076.a0f0 {\n")
-                f.write(f" stream_data: {len(self.stations)}\n")
-                
-                # Escreve cada estação
-                for i, station in enumerate(self.stations):
-                    url_encoded = self.encode_to_escaped(station['url'])
-                    name_encoded = self.encode_to_escaped(station['name'])
-                    genre_encoded = self.encode_to_escaped(station['genre'])
-                
-                    line = f' stream_data[{i}]: "{url_encoded}|{name_encoded}|{genre_encoded}|{station["country"]}|{station["bitrate"]}|{int(station["favorite"])}"\n'
-                    f.write(line)
-                
-                # Fecha a estrutura
-                f.write(" }\n")
-                f.write("}\n")
+            if self.document is not None:
+                # Regrava só os registros alterados, preservando o resto do arquivo original
+                try:
+                    self.document.save(self.current_file, self.stations)
+                except core.FileChangedError:
+                    # O jogo (ou outro programa) alterou o arquivo depois de aberto
+                    if not messagebox.askyesno(
+                        self.config['messages'].get('warning_title', 'Warning'),
+                        self.config['messages'].get(
+                            'file_changed',
+                            'The file was changed outside the editor since it was opened.\n'
+                            'Overwrite its stations with the list shown here?'
+                        )
+                    ):
+                        return
+                    self.document.reload()
+                    self.document.save(self.current_file, self.stations)
+                saved_data = self.document.data
+            else:
+                self.write_file(self.current_file)
+                with open(self.current_file, 'rb') as f:
+                    saved_data = f.read()
+
+            # As edições já estão no arquivo: o diário volta a ficar vazio
+            if self.journal is not None:
+                try:
+                    self.journal.compact(fingerprint(saved_data))
+                except OSError as e:
+                    # O arquivo já foi salvo; só o diário ficou indisponível
+                    self.disable_journal(e)
         
             messagebox.showinfo(
                 self.config['messages'].get('success_title', 'Success'),
@@ -381,73 +682,115 @@ class RadioStationEditor:
                 self.config['messages']['save_error'].format(error=str(e))
             )
 
+    # Leitura, gravação e codificação ficam em core.py (sem tkinter);
+    # os métodos abaixo só delegam para lá
+    def write_file(self, filename):
+        core.write_file(filename, self.stations)
+
     def load_file(self, filename):
-        stations = []
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                line = line.strip()
-                if not line:
-                    continue
-                station = self.parse_line(line)
-                if station:
-                    stations.append(station)
-        return stations
-    
+        # Mantém o documento original para salvar só o que mudou
+        self.document = core.load_document(filename)
+        return self.document.stations()
+
     def parse_line(self, line):
-        match = re.search(r'"(.*?)"', line)
-        if not match:
-            return None
-        
-        content = match.group(1)
-        parts = content.split('|')
-        
-        if len(parts) < 5:
-            return None
-        
-        # Decodifica cada parte
-        decoded_parts = [self.decode_escaped_string(part) for part in parts]
-        
-        return {
-            'url': decoded_parts[0],
-            'name': decoded_parts[1],
-            'genre': decoded_parts[2],
-            'country': decoded_parts[3],
-            'bitrate': decoded_parts[4],
-            'favorite': bool(int(decoded_parts[5])) if len(decoded_parts) > 5 else False
-        }
-    
+        return core.parse_line(line)
+
     def decode_escaped_string(self, s):
-        try:
-            # Primeiro, interpreta as sequências de escape (como \xd0) como bytes
-            bytes_content = s.encode('latin1').decode('unicode-escape').encode('latin1')
-            
-            # Agora decodifica os bytes resultantes como UTF-8
-            decoded = bytes_content.decode('utf-8')
-            return decoded
-        except Exception as e:
-            print(f"Erro ao decodificar '{s}': {e}")
-            return s
+        return core.decode_escaped_string(s)
 
     def encode_to_escaped(self, s):
-        try:
-            # Converte para bytes UTF-8, depois cria sequência de escape
-            escaped = s.encode('utf-8').decode('latin1').encode('unicode-escape').decode('ascii')
-            return escaped
-        except Exception as e:
-            print(f"Erro ao codificar '{s}': {e}")
-            return s
+        return core.encode_to_escaped(s)
     
     def update_treeview(self):
         self.tree.delete(*self.tree.get_children())
-        for station in self.stations:
-            self.tree.insert('', 'end', values=(
+        invalid = set(self.validator.invalid_indices())
+        # O iid de cada linha é o índice da estação, para que a ordenação não perca a referência
+        for i, station in enumerate(self.stations):
+            self.tree.insert('', 'end', iid=str(i), values=(
                 '★' if station['favorite'] else '',
                 station['name'],
                 station['genre'],
                 station['country'],
                 station['bitrate']
-            ))
+            ), tags=('invalid',) if i in invalid else ())
+        self.refresh_issues_panel()
+
+    def refresh_issues_panel(self):
+        """Atualiza a lista de problemas exibida no painel lateral"""
+        messages = self.config['messages']
+        self.issue_rows = []
+        self.issues_list.delete(0, tk.END)
+
+        for index, issue in self.validator.issues():
+            label = messages.get(f"{issue['field']}_label", issue['field']).rstrip(':')
+            text = messages.get(f"issue_{issue['code']}", ISSUE_MESSAGES[issue['code']])
+            self.issues_list.insert(tk.END, f"#{index + 1} {label}: {text}")
+            self.issue_rows.append(index)
+
+        if not self.issue_rows:
+            self.issues_list.insert(tk.END, messages.get('no_issues', 'No problems found'))
+
+    def jump_to_issue(self):
+        """Seleciona na lista a estação do problema escolhido no painel"""
+        selection = self.issues_list.curselection()
+        if not selection or selection[0] >= len(self.issue_rows):
+            return
+        item_id = str(self.issue_rows[selection[0]])
+        self.tree.selection_set(item_id)
+        self.tree.focus(item_id)
+        self.tree.see(item_id)
+
+    def fix_all_issues(self):
+        """Aplica as correções automáticas em todas as estações que as permitem"""
+        indices = self.validator.fixable_indices()
+        for index in indices:
+            self.stations[index] = fix_station(self.stations[index])
+        if indices:
+            self.record_edit({
+                'op': 'bulk',
+                'ops': [{'op': 'edit', 'index': i, 'station': self.stations[i]} for i in indices]
+            })
+        self.validator.revalidate(self.stations, indices)
+        self.update_treeview()
+
+        messagebox.showinfo(
+            self.config['messages'].get('success_title', 'Success'),
+            self.config['messages'].get('fix_result', '{count} station(s) fixed').format(count=len(indices))
+        )
     
+    def fix_corrupting_stations(self):
+        """Antes de salvar, corrige (com confirmação) estações que seriam gravadas corrompidas.
+
+        Retorna False se o usuário preferir não salvar.
+        """
+        # A lista pode ter sido trocada sem passar pela validação incremental
+        if len(self.validator.rows) != len(self.stations):
+            self.validator.validate_all(self.stations)
+
+        indices = self.validator.corrupting_indices()
+        if not indices:
+            return True
+        if not messagebox.askyesno(
+            self.config['messages'].get('warning_title', 'Warning'),
+            self.config['messages'].get(
+                'save_corrupt_confirm',
+                '{count} station(s) would be corrupted on save '
+                '(| or " in a field, or a control character in country or bitrate).\n'
+                'Fix them automatically now?'
+            ).format(count=len(indices))
+        ):
+            return False
+
+        for index in indices:
+            self.stations[index] = fix_station(self.stations[index])
+        self.record_edit({
+            'op': 'bulk',
+            'ops': [{'op': 'edit', 'index': i, 'station': self.stations[i]} for i in indices]
+        })
+        self.validator.revalidate(self.stations, indices)
+        self.update_treeview()
+        return True
+
     def add_station(self):
         self.edit_station(None)
     
@@ -460,7 +803,7 @@ class RadioStationEditor:
             )
             return
         item_id = selected[0]
-        index = self.tree.index(item_id)
+        index = int(item_id)
         self.edit_station(index)
 
     def edit_station(self, index=None):
@@ -537,9 +880,15 @@ class RadioStationEditor:
 
             if index is None:
                 self.stations.append(new_station)
+                changed = len(self.stations) - 1
+                self.record_edit({'op': 'add', 'station': new_station})
             else:
                 self.stations[index] = new_station
+                changed = index
+                self.record_edit({'op': 'edit', 'index': index, 'station': new_station})
 
+            # Revalida só a estação alterada
+            self.validator.revalidate(self.stations, [changed])
             self.update_treeview()
             edit_win.destroy()
 
@@ -559,8 +908,10 @@ class RadioStationEditor:
             self.config['messages']['confirm_remove']
         ):
             item_id = selected[0]
-            index = self.tree.index(item_id)
+            index = int(item_id)
             del self.stations[index]
+            self.record_edit({'op': 'remove', 'index': index})
+            self.validator.remove(index)
             self.update_treeview()
 
     def debug_language_files(self):
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+import core
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_FILE = os.path.join(BASE_DIR, 'test_radio.sii')
+
+# Limite generoso para não falhar em máquinas lentas; importar a interface leva bem mais
+MAX_IMPORT_SECONDS = 0.5
+
+
+class TestCore(unittest.TestCase):
+    def test_import_without_tkinter(self):
+        """Testa que o núcleo importa rápido e sem carregar tkinter"""
+        code = (
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            "import core\n"
+            "print(time.perf_counter() - start)\n"
+            "print('tkinter' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        )
+        elapsed, has_tkinter = result.stdout.split()
+
+        self.assertEqual(has_tkinter, 'False')
+        self.assertLess(float(elapsed), MAX_IMPORT_SECONDS)
+
+    def test_decode_and_encode(self):
+        """Testa a codificação das sequências de escape usadas pelo jogo"""
+        self.assertEqual(core.decode_escaped_string(r'R\xc3\xa1dio Paju\xc3\xa7ara'), 'Rádio Pajuçara')
+        self.assertEqual(core.encode_to_escaped('Rádio Pajuçara'), r'R\xc3\xa1dio Paju\xc3\xa7ara')
+        self.assertEqual(core.encode_to_escaped('Radio FM'), 'Radio FM')
+        self.assertEqual(core.decode_escaped_string(core.encode_to_escaped('a\\b\tc')), 'a\\b\tc')
+
+    def test_parse_line(self):
+        """Testa a leitura de uma linha stream_data[i]"""
+        station = core.parse_line(r' stream_data[8]: "http://x/fmplus|Radio (\xd0\xa0)|Pop|BG|128|1"')
+        self.assertEqual(station, {
+            'url': 'http://x/fmplus', 'name': 'Radio (Р)', 'genre': 'Pop',
+            'country': 'BG', 'bitrate': '128', 'favorite': True
+        })
+        self.assertIsNone(core.parse_line(' stream_data: 293'))
+        self.assertIsNone(core.parse_line(' stream_data[0]: "a|b|c"'))
+
+    def test_write_and_load_round_trip(self):
+        """Testa que o arquivo gravado do zero é lido de volta igual"""
+        stations = core.load_file(TEST_FILE)
+        test_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(test_dir, 'novo.sii')
+            core.write_file(path, stations)
+            self.assertEqual(core.load_file(path), stations)
+            with open(path, 'rb') as f:
+                self.assertEqual(core.read_station_count(f.read()), len(stations))
+        finally:
+            shutil.rmtree(test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
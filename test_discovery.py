@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import discovery
+from discovery import StationFileFinder, read_header
+
+HEADER = "SiiNunit\n{\nlive_stream_def : _nameless.28a.c076.a0f0 {\n stream_data: {count}\n }\n}\n"
+
+
+class TestDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.ets2 = os.path.join(self.test_dir, 'Euro Truck Simulator 2')
+        self.ats = os.path.join(self.test_dir, 'American Truck Simulator')
+
+        # Perfil "Andre" (nome em hexadecimal), arquivo global e um perfil Steam do ATS
+        self.profile_file = self.write(self.ets2, 'profiles', '416E647265', 'live_streams.sii', count=12)
+        self.global_file = self.write(self.ets2, 'live_streams.sii', count=293)
+        self.ats_file = self.write(self.ats, 'steam_profiles', '4A6F7365', 'live_streams.sii', count=3)
+        # Arquivos dentro de pastas ignoradas não devem aparecer
+        self.write(self.ets2, 'profiles', '416E647265', 'save', 'autosave', 'live_streams.sii', count=1)
+        self.write(self.ets2, 'mod', 'live_streams.sii', count=1)
+
+        self.cache_path = os.path.join(self.test_dir, 'cache.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write(self, *parts, count):
+        path = os.path.join(*parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(HEADER.replace('{count}', str(count)))
+        return path
+
+    def finder(self):
+        return StationFileFinder([self.ets2, self.ats], cache_path=self.cache_path, max_workers=4)
+
+    def test_find_prunes_ignored_folders(self):
+        """Testa que só os arquivos fora das pastas ignoradas são encontrados"""
+        self.assertEqual(self.finder().find(), sorted([self.profile_file, self.global_file, self.ats_file]))
+
+    def test_discover_reads_header(self):
+        """Testa jogo, perfil e quantidade de estações de cada arquivo"""
+        found = {info['path']: info for info in self.finder().discover()}
+
+        self.assertEqual(found[self.profile_file]['game'], 'ETS2')
+        self.assertEqual(found[self.profile_file]['profile'], 'Andre')
+        self.assertEqual(found[self.profile_file]['count'], 12)
+        self.assertEqual(found[self.global_file]['profile'], '')
+        self.assertEqual(found[self.ats_file]['game'], 'ATS')
+        self.assertEqual(found[self.ats_file]['profile'], 'Jose')
+
+    def test_read_header_only_reads_start(self):
+        """Testa que a contagem é lida sem percorrer o arquivo inteiro"""
+        with open(self.global_file, 'a', encoding='utf-8') as f:
+            f.write('x' * (discovery.HEADER_SIZE * 2))
+        self.assertEqual(read_header(self.global_file)['count'], 293)
+
+    def test_rescan_uses_cache(self):
+        """Testa que pastas com mtime inalterado não são listadas de novo"""
+        self.finder().find()
+
+        with patch('discovery.os.scandir', wraps=os.scandir) as mock_scandir:
+            found = self.finder().find()
+        self.assertEqual(mock_scandir.call_count, 0)
+        self.assertEqual(len(found), 3)
+
+    def test_rescan_picks_up_changed_folder(self):
+        """Testa que uma pasta alterada é listada de novo"""
+        self.finder().find()
+        new_file = self.write(self.ats, 'steam_profiles', '4E6F766F', 'live_streams.sii', count=7)
+        # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+        folder = os.path.join(self.ats, 'steam_profiles')
+        stat = os.stat(folder)
+        os.utime(folder, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        with patch('discovery.os.scandir', wraps=os.scandir) as mock_scandir:
+            found = self.finder().find()
+        self.assertIn(new_file, found)
+        self.assertEqual(mock_scandir.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+import core
+from main import RadioStationEditor
+from importer import StationImporter, iter_json_records, normalize_url, to_station
+
+RECORDS = [
+    {'name': 'Rádio Um', 'url': 'http://um.example/live', 'url_resolved': 'https://um.example/live/',
+     'tags': 'pop,rock', 'countrycode': 'BR', 'bitrate': 128, 'codec': 'MP3'},
+    {'name': 'Radio "Dois" | Jazz', 'url': 'http://dois.example:8000/stream ',
+     'tags': 'jazz', 'countrycode': 'PT', 'bitrate': 64, 'codec': 'AAC'},
+    {'name': 'Radio Três', 'url': 'http://tres.example/mp3',
+     'tags': 'Rock', 'countrycode': 'br', 'bitrate': 0, 'codec': 'MP3'},
+    {'name': 'Rádio Um (espelho)', 'url': 'HTTPS://UM.example:443/live',
+     'tags': 'pop', 'countrycode': 'BR', 'bitrate': 128, 'codec': 'MP3'},
+    {'name': '', 'url': 'http://sem-nome.example/', 'tags': '', 'countrycode': 'DE', 'bitrate': 128, 'codec': 'MP3'},
+]
+
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_json(self, name='dump.json', lines=False):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            if lines:
+                f.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in RECORDS)
+            else:
+                json.dump(RECORDS, f, ensure_ascii=False, indent=2)
+        return path
+
+    def write_csv(self):
+        path = os.path.join(self.test_dir, 'dump.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(RECORDS[0]))
+            writer.writeheader()
+            writer.writerows(RECORDS)
+        return path
+
+    def test_streaming_json_small_chunks(self):
+        """Testa a leitura em blocos menores que um registro"""
+        text = json.dumps(RECORDS, ensure_ascii=False)
+        records = list(iter_json_records(io.StringIO(text), chunk_size=7))
+        self.assertEqual(records, RECORDS)
+
+    def test_formats_give_same_result(self):
+        """Testa que JSON, JSON Lines e CSV produzem as mesmas estações"""
+        results = [
+            list(StationImporter().run(path))
+            for path in (self.write_json(), self.write_json('dump.jsonl', lines=True), self.write_csv())
+        ]
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+    def test_mapping_and_dedupe(self):
+        """Testa o mapeamento para o formato do editor e a remoção de duplicadas"""
+        importer = StationImporter()
+        stations = list(importer.run(self.write_json()))
+
+        self.assertEqual([s['name'] for s in stations], ['Rádio Um', "Radio 'Dois' / Jazz", 'Radio Três'])
+        self.assertEqual(stations[0], {
+            'url': 'https://um.example/live/', 'name': 'Rádio Um', 'genre': 'pop, rock',
+            'country': 'BR', 'bitrate': '128', 'favorite': False
+        })
+        self.assertEqual(stations[1]['url'], 'http://dois.example:8000/stream')
+        self.assertEqual(stations[2]['country'], 'BR')
+        self.assertEqual(stations[2]['bitrate'], '128')
+        self.assertEqual(importer.stats.records, 5)
+        self.assertEqual(importer.stats.duplicates, 1)
+        self.assertEqual(importer.stats.invalid, 1)
+        self.assertGreater(importer.stats.rate, 0)
+
+    def test_filters(self):
+        """Testa os filtros de país, tag, bitrate e codec"""
+        path = self.write_json()
+        names = lambda importer: [s['name'] for s in importer.run(path)]
+
+        self.assertEqual(names(StationImporter(countries=['pt'])), ["Radio 'Dois' / Jazz"])
+        self.assertEqual(names(StationImporter(tags=['rock'])), ['Rádio Um', 'Radio Três'])
+        self.assertEqual(names(StationImporter(min_bitrate=100)), ['Rádio Um'])
+        self.assertEqual(names(StationImporter(codecs=['aac'])), ["Radio 'Dois' / Jazz"])
+
+    def test_dedupe_against_loaded_stations(self):
+        """Testa que estações já carregadas não são importadas de novo"""
+        existing = [to_station({'name': 'Três', 'url': 'http://TRES.example:80/mp3/'})]
+        stations = list(StationImporter().run(self.write_json(), existing))
+        self.assertNotIn('Radio Três', [s['name'] for s in stations])
+
+    def test_normalize_url(self):
+        """Testa a normalização de URLs para comparação"""
+        self.assertEqual(normalize_url(' HTTP://Example.com:80/live/ '), 'http://example.com/live')
+        self.assertEqual(normalize_url('http://example.com:8000/live#x'), 'http://example.com:8000/live')
+        self.assertEqual(normalize_url('http://example.com/live?a=1'), 'http://example.com/live?a=1')
+
+    def test_import_into_editor_round_trip(self):
+        """Testa que as estações importadas sobrevivem à codificação do arquivo .sii"""
+        editor = RadioStationEditor(MagicMock())
+        with patch('main.messagebox') as mock_messagebox:
+            editor.import_from_file(self.write_json(), StationImporter())
+
+        self.assertEqual(len(editor.stations), 3)
+        self.assertTrue(mock_messagebox.showinfo.called)
+        for station in editor.stations:
+            line = f' stream_data[0]: "{core.format_record(station)}"'
+            self.assertEqual(core.parse_line(line), station)
+
+
+if __name__ == '__main__':
+    unittest.main()
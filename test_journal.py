@@ -0,0 +1,293 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from main import RadioStationEditor
+from journal import EditJournal, apply_operation, fingerprint, journal_path
+
+TEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_radio.sii')
+
+
+def make_station(name):
+    return {
+        'url': f'http://example.com/{name}',
+        'name': name,
+        'genre': 'Pop',
+        'country': 'BR',
+        'bitrate': '128',
+        'favorite': False
+    }
+
+
+class TestEditJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'live_streams.sii.journal')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_append_and_read_pending(self):
+        """Testa que as operações gravadas são lidas de volta na ordem"""
+        journal = EditJournal(self.path, 'base-1', sync_every=2)
+        journal.open()
+        journal.append({'op': 'add', 'station': make_station('A')})
+        journal.append({'op': 'remove', 'index': 0})
+        journal.append({'op': 'add', 'station': make_station('B')})
+        journal.close()
+
+        pending = EditJournal(self.path, 'base-1').pending()
+        self.assertEqual([op['op'] for op in pending], ['add', 'remove', 'add'])
+
+    def test_other_base_is_ignored(self):
+        """Testa que o diário de outra versão do arquivo não é reaplicado"""
+        journal = EditJournal(self.path, 'base-1')
+        journal.open()
+        journal.append({'op': 'remove', 'index': 0})
+        journal.close()
+
+        self.assertEqual(EditJournal(self.path, 'base-2').pending(), [])
+
+    def test_stale_journal_is_set_aside(self):
+        """Testa que o diário de outra base é movido para .stale em vez de apagado"""
+        journal = EditJournal(self.path, 'base-1')
+        journal.open()
+        journal.append({'op': 'remove', 'index': 0})
+        journal.close()
+
+        other = EditJournal(self.path, 'base-2')
+        self.assertEqual(len(other.stale()), 1)
+        stale_path = other.set_aside()
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(EditJournal(stale_path, 'base-1').pending(), [{'op': 'remove', 'index': 0}])
+
+    def test_torn_tail_is_ignored(self):
+        """Testa que uma linha incompleta (queda durante a escrita) é descartada"""
+        journal = EditJournal(self.path, 'base-1')
+        journal.open()
+        journal.append({'op': 'add', 'station': make_station('A')})
+        journal.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'{"op": "remove", "ind')
+
+        self.assertEqual(len(EditJournal(self.path, 'base-1').pending()), 1)
+
+    def test_compact(self):
+        """Testa que compactar após salvar deixa o diário vazio para a nova base"""
+        journal = EditJournal(self.path, 'base-1')
+        journal.open()
+        journal.append({'op': 'add', 'station': make_station('A')})
+        journal.compact('base-2')
+        journal.close()
+
+        self.assertEqual(EditJournal(self.path, 'base-2').pending(), [])
+        with open(self.path, 'rb') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_apply_operations(self):
+        """Testa a aplicação de cada tipo de operação"""
+        stations = [make_station('A'), make_station('B')]
+        apply_operation(stations, {'op': 'add', 'station': make_station('C')})
+        apply_operation(stations, {'op': 'edit', 'index': 0, 'station': make_station('Z')})
+        apply_operation(stations, {'op': 'bulk', 'ops': [
+            {'op': 'remove', 'index': 1},
+            {'op': 'edit', 'index': 1, 'station': make_station('Y')}
+        ]})
+        self.assertEqual([s['name'] for s in stations], ['Z', 'Y'])
+
+        # Um lote com erro não é aplicado pela metade
+        with self.assertRaises(IndexError):
+            apply_operation(stations, {'op': 'bulk', 'ops': [
+                {'op': 'remove', 'index': 0},
+                {'op': 'remove', 'index': 5}
+            ]})
+        self.assertEqual([s['name'] for s in stations], ['Z', 'Y'])
+
+
+class TestJournalRecovery(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.test_dir, 'live_streams.sii')
+        shutil.copy(TEST_FILE, self.test_file)
+
+        self.patcher_filedialog = patch('main.filedialog.askopenfilename', return_value=self.test_file)
+        self.patcher_filedialog.start()
+        self.patcher_messagebox = patch('main.messagebox')
+        self.mock_messagebox = self.patcher_messagebox.start()
+        self.mock_messagebox.askyesno.return_value = True
+
+    def tearDown(self):
+        self.patcher_filedialog.stop()
+        self.patcher_messagebox.stop()
+        shutil.rmtree(self.test_dir)
+
+    def test_recover_after_crash(self):
+        """Testa que edições não salvas são reaplicadas ao reabrir o arquivo"""
+        editor = RadioStationEditor(MagicMock())
+        editor.open_file()
+        editor.record_edit({'op': 'remove', 'index': 0})
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        # Simula a queda do programa: o diário não é fechado
+
+        recovered = RadioStationEditor(MagicMock())
+        recovered.open_file()
+
+        self.assertEqual(len(recovered.stations), 293)
+        self.assertEqual(recovered.stations[0]['name'], 'Oldie Party Austria')
+        self.assertEqual(recovered.stations[-1]['name'], 'Nova')
+        recovered.journal.close()
+
+    def test_malformed_entry_keeps_remaining_edits(self):
+        """Testa que uma entrada inválida no diário não derruba a abertura nem apaga as edições seguintes"""
+        editor = RadioStationEditor(MagicMock())
+        editor.open_file()
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        editor.journal.file.write(b'["not", "an", "operation"]\n')
+        editor.record_edit({'op': 'add', 'station': make_station('Depois')})
+        editor.journal.close()
+
+        recovered = RadioStationEditor(MagicMock())
+        recovered.tree = MagicMock()
+        recovered.open_file()
+        recovered.journal.close()
+
+        self.assertEqual(recovered.stations[-1]['name'], 'Nova')
+        self.assertEqual(recovered.tree.insert.call_count, len(recovered.stations))
+        self.assertEqual(len(recovered.validator.rows), len(recovered.stations))
+        self.assertTrue(self.mock_messagebox.showwarning.called)
+        self.assertEqual(len(recovered.journal.pending()), 1)
+
+        # O diário completo, com a edição que não foi aplicada, fica guardado à parte
+        with open(journal_path(self.test_file) + '.stale', 'rb') as f:
+            self.assertIn(b'Depois', f.read())
+
+    def test_changed_base_keeps_stale_edits(self):
+        """Testa que edições feitas antes de o jogo alterar o arquivo não são perdidas"""
+        editor = RadioStationEditor(MagicMock())
+        editor.open_file()
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        editor.journal.close()
+
+        # O jogo alterou um byte do arquivo (ex.: favorita marcada no jogo)
+        with open(self.test_file, 'rb') as f:
+            data = f.read()
+        with open(self.test_file, 'wb') as f:
+            f.write(data.replace(b'|Local|AT|256|0"', b'|Local|AT|256|1"', 1))
+
+        self.mock_messagebox.askyesno.return_value = False
+        declined = RadioStationEditor(MagicMock())
+        declined.open_file()
+        declined.journal.close()
+
+        self.assertTrue(self.mock_messagebox.askyesno.called)
+        stale_path = journal_path(self.test_file) + '.stale'
+        self.assertTrue(os.path.exists(stale_path))
+        self.assertEqual(len(declined.stations), 293)
+
+        # Recusar não apaga o diário guardado; ele pode ser reaplicado manualmente
+        with open(stale_path, 'rb') as f:
+            self.assertIn(b'Nova', f.read())
+
+    def test_changed_base_replay_anyway(self):
+        """Testa a reaplicação de um diário de outra versão do arquivo quando o usuário aceita"""
+        editor = RadioStationEditor(MagicMock())
+        editor.open_file()
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        editor.journal.close()
+
+        with open(self.test_file, 'ab') as f:
+            f.write(b'\n')
+
+        recovered = RadioStationEditor(MagicMock())
+        recovered.open_file()
+        recovered.journal.close()
+
+        self.assertEqual(recovered.stations[-1]['name'], 'Nova')
+        self.assertEqual(len(recovered.journal.pending()), 1)
+
+    def test_single_edit_is_synced_by_timer(self):
+        """Testa que uma edição isolada recebe fsync no intervalo, sem esperar outra edição"""
+        root = MagicMock()
+        editor = RadioStationEditor(root)
+        editor.open_file()
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        self.assertEqual(editor.journal.unsynced, 1)
+
+        root.after.assert_called_once_with(2000, editor.sync_journal)
+        with patch('journal.os.fsync') as mock_fsync:
+            editor.sync_journal()
+        self.assertTrue(mock_fsync.called)
+        self.assertEqual(editor.journal.unsynced, 0)
+
+        # Um novo timer é agendado para a próxima edição
+        editor.record_edit({'op': 'remove', 'index': 0})
+        self.assertEqual(root.after.call_count, 2)
+        editor.journal.close()
+
+    def test_save_compacts_journal(self):
+        """Testa que após salvar não há edições pendentes"""
+        editor = RadioStationEditor(MagicMock())
+        editor.open_file()
+        editor.stations.append(make_station('Nova'))
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        editor.save_file()
+        editor.journal.close()
+
+        with open(self.test_file, 'rb') as f:
+            base = fingerprint(f.read())
+        self.assertEqual(EditJournal(journal_path(self.test_file), base).pending(), [])
+
+    def test_open_without_writable_journal(self):
+        """Testa que o arquivo abre e é exibido mesmo se o diário não puder ser gravado"""
+        editor = RadioStationEditor(MagicMock())
+        editor.tree = MagicMock()
+        with patch('main.EditJournal.open', side_effect=PermissionError('read-only')):
+            editor.open_file()
+
+        self.assertIsNone(editor.journal)
+        self.assertEqual(len(editor.stations), 293)
+        self.assertEqual(len(editor.validator.rows), 293)
+        self.assertEqual(editor.tree.insert.call_count, 293)
+        self.assertTrue(self.mock_messagebox.showwarning.called)
+
+        # Sem diário, as edições continuam funcionando
+        editor.stations.append(make_station('Nova'))
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        self.assertEqual(editor.stations[-1]['name'], 'Nova')
+
+    def test_failed_append_disables_journal(self):
+        """Testa que uma falha ao gravar uma edição desliga o diário e avisa o usuário"""
+        editor = RadioStationEditor(MagicMock())
+        editor.open_file()
+        with patch('main.EditJournal.append', side_effect=OSError('disk full')):
+            editor.record_edit({'op': 'remove', 'index': 0})
+
+        self.assertIsNone(editor.journal)
+        self.assertTrue(self.mock_messagebox.showwarning.called)
+        # Nenhuma edição seguinte é gravada num diário incompleto
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+
+    def test_close_with_failed_sync(self):
+        """Testa que a janela fecha mesmo se o fsync final do diário falhar"""
+        root = MagicMock()
+        editor = RadioStationEditor(root)
+        editor.open_file()
+        editor.record_edit({'op': 'add', 'station': make_station('Nova')})
+        journal = editor.journal
+
+        with patch('journal.os.fsync', side_effect=OSError('I/O error')):
+            editor.on_close()
+
+        root.destroy.assert_called_once_with()
+        self.assertIsNone(journal.file)
+        self.assertIsNone(editor.journal)
+        self.assertTrue(self.mock_messagebox.showwarning.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+import core
+from main import RadioStationEditor
+
+TEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_radio.sii')
+
+CUSTOM_FILE = (
+    b'SiiNunit\r\n'
+    b'{\r\n'
+    b'live_stream_def : _nameless.1a2.b3c4.d5e6 {\r\n'
+    b' stream_data: 2\r\n'
+    b' stream_data[0]: "http://a.example/live|R\\xc3\\xa1dio A|Pop|BR|128|0"\r\n'
+    b' stream_data[1]: "http://b.example/live|Radio B|Rock|DE|192|1"\r\n'
+    b' unknown_attribute: 42\r\n'
+    b' }\r\n'
+    b'}\r\n'
+)
+
+
+class TestSiiDocument(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.test_dir, 'live_streams.sii')
+        shutil.copy(TEST_FILE, self.test_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def read(self, path=None):
+        with open(path or self.test_file, 'rb') as f:
+            return f.read()
+
+    def load(self):
+        self.document = core.load_document(self.test_file)
+        return self.document.stations()
+
+    def save(self, stations):
+        self.document.save(self.test_file, stations)
+
+    def test_unchanged_save_is_byte_identical(self):
+        """Testa que salvar sem alterações mantém o arquivo idêntico"""
+        original = self.read()
+        stations = self.load()
+        self.assertEqual(len(stations), 293)
+
+        self.save(stations)
+        self.assertEqual(self.read(), original)
+
+    def test_edit_rewrites_only_changed_record(self):
+        """Testa que a edição altera apenas a linha do registro editado"""
+        original = self.read().split(b'\n')
+        stations = self.load()
+        stations[5] = dict(stations[5], name='MNM Hits')
+
+        self.save(stations)
+        saved = self.read().split(b'\n')
+        changed = [i for i, (a, b) in enumerate(zip(original, saved)) if a != b]
+        self.assertEqual(len(saved), len(original))
+        self.assertEqual(changed, [9])
+        self.assertEqual(saved[9], b' stream_data[5]: "http://icecast.vrtcdn.be/mnm-high.mp3|MNM Hits|Pop|BE|128|0"')
+
+    def test_add_and_remove_keep_unit_and_unknown_attributes(self):
+        """Testa adição e remoção preservando nome da unidade, atributos desconhecidos e CRLF"""
+        with open(self.test_file, 'wb') as f:
+            f.write(CUSTOM_FILE)
+
+        stations = self.load()
+        self.assertEqual(stations[0]['name'], 'Rádio A')
+
+        del stations[0]
+        stations.append({
+            'url': 'http://c.example/live', 'name': 'Rádio C', 'genre': 'Jazz',
+            'country': 'FR', 'bitrate': '96', 'favorite': False
+        })
+        self.save(stations)
+
+        self.assertEqual(self.read(), (
+            b'SiiNunit\r\n'
+            b'{\r\n'
+            b'live_stream_def : _nameless.1a2.b3c4.d5e6 {\r\n'
+            b' stream_data: 2\r\n'
+            b' stream_data[0]: "http://b.example/live|Radio B|Rock|DE|192|1"\r\n'
+            b' stream_data[1]: "http://c.example/live|R\\xc3\\xa1dio C|Jazz|FR|96|0"\r\n'
+            b' unknown_attribute: 42\r\n'
+            b' }\r\n'
+            b'}\r\n'
+        ))
+
+    def test_consecutive_saves(self):
+        """Testa vários salvamentos seguidos com o mesmo documento"""
+        stations = self.load()
+        document = self.document
+
+        stations.append(dict(stations[0], name='Nova'))
+        self.save(stations)
+        del stations[10]
+        self.save(stations)
+        stations[0] = dict(stations[0], favorite=True)
+        self.save(stations)
+
+        self.assertEqual(self.read(), document.data)
+        self.assertEqual(core.load_file(self.test_file), stations)
+
+    def test_external_change_is_detected(self):
+        """Testa que um arquivo alterado no disco (mesmo tamanho, outro layout) não é sobrescrito"""
+        with open(self.test_file, 'wb') as f:
+            f.write(CUSTOM_FILE)
+        stations = self.load()
+
+        # O jogo regrava o arquivo: mesmo tamanho, registros em posições diferentes
+        changed = CUSTOM_FILE.replace(b'Pop|BR', b'PopPop|BR').replace(b'Radio B|Rock', b'RadB|Rock')
+        self.assertEqual(len(changed), len(CUSTOM_FILE))
+        with open(self.test_file, 'wb') as f:
+            f.write(changed)
+        os.utime(self.test_file, ns=(0, 0))
+
+        stations[1] = dict(stations[1], name='Radio B2')
+        with self.assertRaises(core.FileChangedError):
+            self.save(stations)
+        self.assertEqual(self.read(), changed)
+
+        # Depois de reler, o diff é feito sobre os bytes atuais
+        self.document.reload()
+        self.save(stations)
+        self.assertEqual(core.load_file(self.test_file), stations)
+
+    def test_failed_save_keeps_original(self):
+        """Testa que uma falha no meio do salvamento não corrompe o arquivo original"""
+        original = self.read()
+        stations = self.load()
+        stations[0] = dict(stations[0], name='Outro nome')
+
+        with patch('core.os.replace', side_effect=OSError('disco cheio')):
+            with self.assertRaises(OSError):
+                self.save(stations)
+
+        self.assertEqual(self.read(), original)
+        self.assertEqual(os.listdir(self.test_dir), ['live_streams.sii'])
+        self.assertEqual(self.document.data, original)
+
+        # O documento continua utilizável depois da falha
+        self.save(stations)
+        self.assertEqual(core.load_file(self.test_file), stations)
+
+    def test_save_file_asks_before_overwriting_external_change(self):
+        """Testa que save_file pergunta antes de sobrescrever um arquivo alterado fora do editor"""
+        editor = RadioStationEditor(MagicMock())
+        editor.current_file = self.test_file
+        editor.stations = editor.load_file(self.test_file)
+        editor.stations[0] = dict(editor.stations[0], favorite=True)
+
+        with open(self.test_file, 'ab') as f:
+            f.write(b'\n')
+        changed = self.read()
+
+        with patch('main.messagebox') as mock_messagebox:
+            mock_messagebox.askyesno.return_value = False
+            editor.save_file()
+        self.assertTrue(mock_messagebox.askyesno.called)
+        self.assertEqual(self.read(), changed)
+
+        with patch('main.messagebox') as mock_messagebox:
+            mock_messagebox.askyesno.return_value = True
+            editor.save_file()
+        self.assertTrue(core.load_file(self.test_file)[0]['favorite'])
+
+    def test_save_file_uses_document(self):
+        """Testa que save_file preserva o cabeçalho original do arquivo"""
+        with open(self.test_file, 'wb') as f:
+            f.write(CUSTOM_FILE)
+        editor = RadioStationEditor(MagicMock())
+        editor.current_file = self.test_file
+        editor.stations = editor.load_file(self.test_file)
+
+        with patch('main.messagebox'):
+            editor.save_file()
+
+        self.assertEqual(self.read(), CUSTOM_FILE)
+
+
+if __name__ == '__main__':
+    unittest.main()
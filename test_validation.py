@@ -0,0 +1,147 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+import core
+from main import RadioStationEditor
+from validation import StationValidator, validate_stations, fix_station
+
+TEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_radio.sii')
+
+
+def make_station(**overrides):
+    station = {
+        'url': 'http://example.com/stream',
+        'name': 'Radio Teste',
+        'genre': 'Pop',
+        'country': 'BR',
+        'bitrate': '128',
+        'favorite': False
+    }
+    station.update(overrides)
+    return station
+
+
+class TestValidation(unittest.TestCase):
+    def test_valid_station(self):
+        """Testa que uma estação correta não gera problemas"""
+        self.assertEqual(validate_stations([make_station()]), [[]])
+
+    def test_detects_each_problem(self):
+        """Testa a detecção de cada tipo de problema"""
+        rows = validate_stations([
+            make_station(bitrate='128kbps'),
+            make_station(country='brazil'),
+            make_station(name='Rock | Pop'),
+            make_station(url='stream.example.com'),
+            make_station(name=''),
+        ])
+        codes = [[(issue['field'], issue['code']) for issue in row] for row in rows]
+        self.assertEqual(codes[0], [('bitrate', 'bitrate_invalid')])
+        self.assertEqual(codes[1], [('country', 'country_invalid')])
+        self.assertEqual(codes[2], [('name', 'forbidden_char')])
+        self.assertEqual(codes[3], [('url', 'url_invalid')])
+        self.assertEqual(codes[4], [('name', 'empty')])
+
+    def test_sample_file(self):
+        """Testa a validação do arquivo de exemplo (stream_data[19] tem espaço na URL)"""
+        stations = core.load_file(TEST_FILE)
+        rows = validate_stations(stations)
+
+        self.assertEqual(len(rows), len(stations))
+        self.assertIn(('url', 'whitespace'), [(i['field'], i['code']) for i in rows[19]])
+
+    def test_fix_station(self):
+        """Testa as correções automáticas"""
+        fixed = fix_station(make_station(
+            url=' http://example.com/my stream ',
+            name='Rock | Pop',
+            country=' de',
+            bitrate='192 kbps'
+        ))
+        self.assertEqual(fixed['url'], 'http://example.com/my%20stream')
+        self.assertEqual(fixed['name'], 'Rock / Pop')
+        self.assertEqual(fixed['country'], 'DE')
+        self.assertEqual(fixed['bitrate'], '192')
+        self.assertEqual(validate_stations([fixed]), [[]])
+
+    def test_unfixable_problem(self):
+        """Testa que problemas sem correção automática não são marcados como corrigíveis"""
+        issues = validate_stations([make_station(bitrate='abc')])[0]
+        self.assertFalse(issues[0]['fixable'])
+
+    def test_incremental_revalidation(self):
+        """Testa que só as linhas alteradas são revalidadas"""
+        stations = [make_station(), make_station(bitrate='x')]
+        validator = StationValidator()
+        validator.validate_all(stations)
+        self.assertEqual(validator.invalid_indices(), [1])
+
+        stations[1] = make_station()
+        stations.append(make_station(country='??'))
+        validator.revalidate(stations, [1, 2])
+        self.assertEqual(validator.invalid_indices(), [2])
+
+        validator.remove(0)
+        self.assertEqual(validator.invalid_indices(), [1])
+
+    def test_control_characters(self):
+        """Testa que tab/quebra de linha só bloqueiam o salvamento em país e bitrate"""
+        stations = [make_station(name='Rock\tPop'), make_station(bitrate='128\n'), make_station(name='A | B')]
+        validator = StationValidator()
+        rows = validator.validate_all(stations)
+
+        self.assertEqual([(i['field'], i['code']) for i in rows[0]], [('name', 'control_char')])
+        self.assertIn(('bitrate', 'control_char'), [(i['field'], i['code']) for i in rows[1]])
+        # Nome com tab é gravado com escape (\t); bitrate com quebra de linha, não
+        self.assertEqual(validator.corrupting_indices(), [1, 2])
+        self.assertEqual(fix_station(stations[0])['name'], 'Rock Pop')
+
+
+
+class TestSaveValidation(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.test_dir, 'live_streams.sii')
+        shutil.copy(TEST_FILE, self.test_file)
+
+        self.editor = RadioStationEditor(MagicMock())
+        self.editor.current_file = self.test_file
+        self.editor.stations = self.editor.load_file(self.test_file)
+        self.editor.stations[3] = dict(self.editor.stations[3], name='Rock | "Pop"')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_save_blocked_when_fix_declined(self):
+        """Testa que o salvamento é cancelado se o usuário não aceitar corrigir as estações"""
+        with open(self.test_file, 'rb') as f:
+            original = f.read()
+
+        with patch('main.messagebox') as mock_messagebox:
+            mock_messagebox.askyesno.return_value = False
+            self.editor.save_file()
+
+        self.assertTrue(mock_messagebox.askyesno.called)
+        self.assertFalse(mock_messagebox.showinfo.called)
+        with open(self.test_file, 'rb') as f:
+            self.assertEqual(f.read(), original)
+
+    def test_save_fixes_forbidden_characters(self):
+        """Testa que nenhuma estação se perde ao salvar um nome com | e aspas"""
+        with patch('main.messagebox') as mock_messagebox:
+            mock_messagebox.askyesno.return_value = True
+            self.editor.save_file()
+
+        stations = core.load_file(self.test_file)
+        self.assertEqual(len(stations), 293)
+        self.assertEqual(stations[3]['name'], "Rock / 'Pop'")
+        self.assertEqual(stations, self.editor.stations)
+
+
+if __name__ == '__main__':
+    unittest.main()
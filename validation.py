@@ -0,0 +1,161 @@
+import re
+
+# Campos verificados em cada estação (na ordem em que aparecem no registro)
+FIELDS = ('url', 'name', 'genre', 'country', 'bitrate')
+
+# Códigos de problema reportados (usados como chave das mensagens traduzidas)
+ISSUE_CODES = (
+    'forbidden_char',
+    'control_char',
+    'whitespace',
+    'empty',
+    'url_invalid',
+    'country_invalid',
+    'bitrate_invalid',
+)
+
+# Caracteres que corrompem o registro ao salvar: '|' separa os campos e
+# '"' encerra o valor de stream_data[i]
+_FORBIDDEN_RE = re.compile(r'[|"]')
+# Caracteres de controle (tab, quebra de linha...): url, nome e gênero são gravados
+# com escape (\t, \n), mas país e bitrate são gravados sem escape
+_CONTROL_RE = re.compile(r'[\x00-\x1f\x7f]')
+_UNESCAPED_FIELDS = ('country', 'bitrate')
+_URL_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://\S+')
+_COUNTRY_RE = re.compile(r'[A-Z]{2,3}')
+_BITRATE_RE = re.compile(r'[0-9]{1,4}')
+_DIGITS_RE = re.compile(r'[0-9]+')
+_FORBIDDEN_REPLACEMENTS = {'|': '/', '"': "'"}
+
+
+def _issue(field, code, value):
+    return {'field': field, 'code': code, 'value': value, 'fixable': fix_value(field, value) != value}
+
+
+def validate_stations(stations):
+    """Valida todas as estações numa única passada por coluna.
+
+    Retorna uma lista paralela a `stations` com a lista de problemas de cada
+    linha (vazia quando a estação é válida).
+    """
+    rows = [[] for _ in stations]
+    if not stations:
+        return rows
+
+    # Monta as colunas uma vez e aplica cada regra compilada à coluna inteira
+    columns = {field: [str(s.get(field, '')) for s in stations] for field in FIELDS}
+
+    for field in FIELDS:
+        values = columns[field]
+        forbidden = list(map(_FORBIDDEN_RE.search, values))
+        control = list(map(_CONTROL_RE.search, values))
+        stripped = [v.strip() for v in values]
+        for i, value in enumerate(values):
+            if forbidden[i]:
+                rows[i].append(_issue(field, 'forbidden_char', value))
+            elif control[i]:
+                rows[i].append(_issue(field, 'control_char', value))
+            elif stripped[i] != value:
+                rows[i].append(_issue(field, 'whitespace', value))
+
+    for field in ('url', 'name'):
+        for i, value in enumerate(columns[field]):
+            if not value.strip():
+                rows[i].append(_issue(field, 'empty', value))
+
+    format_rules = (
+        ('url', _URL_RE, 'url_invalid'),
+        ('country', _COUNTRY_RE, 'country_invalid'),
+        ('bitrate', _BITRATE_RE, 'bitrate_invalid'),
+    )
+    for field, pattern, code in format_rules:
+        values = columns[field]
+        # Espaços nas pontas já foram reportados como 'whitespace'
+        matches = [pattern.fullmatch(v.strip()) for v in values]
+        for i, value in enumerate(values):
+            if not matches[i] and (field != 'url' or value.strip()):
+                rows[i].append(_issue(field, code, value))
+
+    return rows
+
+
+def validate_station(station):
+    """Valida uma única estação"""
+    return validate_stations([station])[0]
+
+
+def fix_value(field, value):
+    """Retorna o valor corrigido automaticamente (ou o próprio valor se não houver correção)"""
+    fixed = ''.join(_FORBIDDEN_REPLACEMENTS.get(c, c) for c in value)
+    fixed = _CONTROL_RE.sub(' ', fixed).strip()
+
+    if field == 'url':
+        # Espaços dentro da URL são codificados em vez de descartados
+        fixed = fixed.replace(' ', '%20')
+    elif field == 'country':
+        candidate = fixed.upper()
+        if _COUNTRY_RE.fullmatch(candidate):
+            fixed = candidate
+    elif field == 'bitrate' and not _BITRATE_RE.fullmatch(fixed):
+        # Ex.: "128 kbps" -> "128"
+        digits = _DIGITS_RE.search(fixed)
+        if digits and _BITRATE_RE.fullmatch(digits.group(0)):
+            fixed = digits.group(0)
+
+    return fixed
+
+
+def fix_station(station):
+    """Retorna uma cópia da estação com todas as correções automáticas aplicadas"""
+    fixed = dict(station)
+    for field in FIELDS:
+        fixed[field] = fix_value(field, str(station.get(field, '')))
+    return fixed
+
+
+def _corrupts(issue):
+    if issue['code'] == 'forbidden_char':
+        return True
+    return issue['code'] == 'control_char' and issue['field'] in _UNESCAPED_FIELDS
+
+
+class StationValidator:
+    """Mantém o resultado da validação paralelo à lista de estações.
+
+    A lista inteira é validada uma vez ao carregar; depois só as linhas
+    alteradas são revalidadas.
+    """
+
+    def __init__(self):
+        self.rows = []
+
+    def validate_all(self, stations):
+        self.rows = validate_stations(stations)
+        return self.rows
+
+    def revalidate(self, stations, indices):
+        """Revalida apenas as linhas indicadas (inclusive linhas recém-adicionadas)"""
+        indices = sorted(set(indices))
+        if len(self.rows) < len(stations):
+            self.rows.extend([] for _ in range(len(stations) - len(self.rows)))
+        results = validate_stations([stations[i] for i in indices])
+        for i, issues in zip(indices, results):
+            self.rows[i] = issues
+
+    def remove(self, index):
+        del self.rows[index]
+
+    def issues(self):
+        """Lista de (índice, problema) de todas as linhas, em ordem"""
+        return [(i, issue) for i, row in enumerate(self.rows) for issue in row]
+
+    def invalid_indices(self):
+        return [i for i, row in enumerate(self.rows) if row]
+
+    def fixable_indices(self):
+        return [i for i, row in enumerate(self.rows) if any(issue['fixable'] for issue in row)]
+
+    def corrupting_indices(self):
+        """Linhas que seriam gravadas corrompidas: '|' ou '"' em algum campo, ou
+        caractere de controle em país ou bitrate (gravados sem escape)"""
+        return [i for i, row in enumerate(self.rows) if any(_corrupts(issue) for issue in row)]